@@ -2,135 +2,22 @@ import streamlit as st
 from google.generativeai import GenerativeModel, configure
 import json
 import os
+import re
 from dotenv import load_dotenv
 
-hide_st_style = """
-            <style>
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-            </style>
-            """
-st.markdown(hide_st_style, unsafe_allow_html=True)
+# Optional Rust-backed JSON parser; stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Load API key (local .env ya cloud secrets)
-load_dotenv()  # Local ke liye .env file se try karega
-api_key = os.getenv("GEMINI_API_KEY") or st.secrets.get("GEMINI_API_KEY", None)
-
-if not api_key:
-    st.warning("⚠️ Please set your GEMINI_API_KEY in .env (local) or secrets.toml (cloud).", icon="🚨")
-    st.stop()
-
-configure(api_key=api_key)
-
-# Conversion function
-def convert_units(value, from_unit, to_unit, category):
-    conversions = {
-        "Length": {
-            "meters": 1.0,
-            "feet": 0.3048,
-            "inches": 0.0254,
-            "centimeters": 0.01,
-            "kilometers": 1000.0,
-            "miles": 1609.34
-        },
-        "Weight": {
-            "kilograms": 1.0,
-            "pounds": 0.453592,
-            "grams": 0.001,
-            "ounces": 0.0283495
-        },
-        "Temperature": {
-            "Celsius": lambda x: x,
-            "Fahrenheit": lambda x: (x * 9/5) + 32,
-            "Kelvin": lambda x: x + 273.15
-        },
-        "Volume": {
-            "liters": 1.0,
-            "gallons": 3.78541,
-            "milliliters": 0.001,
-            "cubic feet": 28.3168
-        }
-    }
-
-    if category == "Temperature":
-        if from_unit == "Fahrenheit":
-            celsius = (value - 32) * 5/9
-        elif from_unit == "Kelvin":
-            celsius = value - 273.15
-        else:
-            celsius = value
-        if to_unit == "Fahrenheit":
-            return (celsius * 9/5) + 32
-        elif to_unit == "Kelvin":
-            return celsius + 273.15
-        else:
-            return celsius
-    
-    to_base = value * conversions[category][from_unit]
-    result = to_base / conversions[category][to_unit]
-    return result
-
-# Gemini Parsing Function
-def parse_with_gemini(input_text):
-    try:
-        model = GenerativeModel(model_name="gemini-1.5-flash")
-        
-        prompt = f"""
-        Parse this conversion request: "{input_text}"
-        Return ONLY valid JSON in this format:
-        {{
-            "value": number,
-            "from_unit": "string",
-            "to_unit": "string",
-            "category": "string"
-        }}
-        The category must be one of: "Length", "Weight", "Temperature", or "Volume".
-        Use full unit names like "centimeters" not "cm", "kilograms" not "kg".
-        """
-
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "temperature": 0.2,
-                "top_p": 0.8,
-                "top_k": 40
-            }
-        )
-
-        raw_response = response.text.strip()
-        
-        if "```json" in raw_response:
-            raw_response = raw_response.split("```json")[1].split("```")[0].strip()
-        elif "```" in raw_response:
-            raw_response = raw_response.split("```")[1].strip()
-            
-        try:
-            result = json.loads(raw_response)
-            
-            required_keys = {"value", "from_unit", "to_unit", "category"}
-            if not required_keys.issubset(result.keys()):
-                st.error("Response is missing required keys.", icon="❌")
-                return None
-                
-            valid_categories = {"Length", "Weight", "Temperature", "Volume"}
-            if result["category"] not in valid_categories:
-                st.error(f"Invalid category: {result['category']}. Must be one of {valid_categories}", icon="❌")
-                return None
-                
-            return float(result["value"]), result["from_unit"], result["to_unit"], result["category"]
-            
-        except json.JSONDecodeError as e:
-            st.error(f"Failed to parse JSON: {e}", icon="❌")
-            return None
-
-    except Exception as e:
-        st.error(f"Gemini API error: {str(e)}", icon="🚫")
-        return None
-
-# Custom CSS for VIP look
-st.markdown("""
+# All custom CSS (chrome hiding + VIP look) in one block, built once at
+# import and emitted with a single st.markdown call per rerun
+app_style = """
     <style>
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
     .stApp {
         background: linear-gradient(135deg, #1e1e2f 0%, #2a2a4a 100%);
         color: #ffffff;
@@ -190,7 +77,233 @@ st.markdown("""
         border-radius: 10px;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(app_style, unsafe_allow_html=True)
+
+# Load API key (local .env ya cloud secrets). Cached so the .env file is
+# parsed and the SDK configured once per process, not on every rerun.
+@st.cache_resource
+def _api_key():
+    load_dotenv()  # Local ke liye .env file se try karega
+    key = os.getenv("GEMINI_API_KEY") or st.secrets.get("GEMINI_API_KEY", None)
+    if key:
+        configure(api_key=key)
+    return key
+
+api_key = _api_key()
+
+if not api_key:
+    st.warning("⚠️ Please set your GEMINI_API_KEY in .env (local) or secrets.toml (cloud).", icon="🚨")
+    st.stop()
+
+# Conversion factors to each category's base unit (meters, kilograms, liters).
+# Temperature is affine rather than ratio-based, so it's handled separately
+# inside convert_units.
+_CONVERSIONS = {
+    "Length": {
+        "meters": 1.0,
+        "feet": 0.3048,
+        "inches": 0.0254,
+        "centimeters": 0.01,
+        "kilometers": 1000.0,
+        "miles": 1609.34
+    },
+    "Weight": {
+        "kilograms": 1.0,
+        "pounds": 0.453592,
+        "grams": 0.001,
+        "ounces": 0.0283495
+    },
+    "Volume": {
+        "liters": 1.0,
+        "gallons": 3.78541,
+        "milliliters": 0.001,
+        "cubic feet": 28.3168
+    }
+}
+
+# Pairwise ratios precomputed at import so a conversion is one dict hit and
+# one multiply, with no division on the hot path.
+_RATIOS = {
+    (category, from_unit, to_unit): from_factor / to_factor
+    for category, factors in _CONVERSIONS.items()
+    for from_unit, from_factor in factors.items()
+    for to_unit, to_factor in factors.items()
+}
+
+# Temperature pairs composed into single (scale, offset) affine maps at
+# import, so one lookup and one multiply-add replaces the nested branches.
+_TO_CELSIUS = {"Celsius": (1.0, 0.0), "Fahrenheit": (5/9, -160/9), "Kelvin": (1.0, -273.15)}
+_FROM_CELSIUS = {"Celsius": (1.0, 0.0), "Fahrenheit": (9/5, 32.0), "Kelvin": (1.0, 273.15)}
+_TEMP_AFFINE = {
+    (from_unit, to_unit): (a2 * a1, a2 * b1 + b2)
+    for from_unit, (a1, b1) in _TO_CELSIUS.items()
+    for to_unit, (a2, b2) in _FROM_CELSIUS.items()
+}
+
+# Shared result template; %-formatting against one constant keeps the two
+# success sites identical and stays cheap if a batch mode ever renders rows
+_RESULT_FMT = "%s %s = **%.4f %s** 🎉"
+
+# Unit options, frozen as tuples so reruns don't rebuild them
+categories = ("Length", "Weight", "Temperature", "Volume")
+unit_options = {
+    "Length": ("meters", "feet", "inches", "centimeters", "kilometers", "miles"),
+    "Weight": ("kilograms", "pounds", "grams", "ounces"),
+    "Temperature": ("Celsius", "Fahrenheit", "Kelvin"),
+    "Volume": ("liters", "gallons", "milliliters", "cubic feet")
+}
+
+# Conversion function. `value` may be a scalar or a NumPy array: both the
+# ratio and temperature paths are single broadcastable expressions, so batch
+# inputs convert in one vectorized op with no Python-level loop.
+def convert_units(value, from_unit, to_unit, category):
+    if category == "Temperature":
+        scale, offset = _TEMP_AFFINE[(from_unit, to_unit)]
+        return scale * value + offset
+    return value * _RATIOS[(category, from_unit, to_unit)]
+
+# One model instance per process: Streamlit reruns the whole script on every
+# interaction, so without caching the SDK client (and its connection state)
+# would be rebuilt on each button click.
+@st.cache_resource
+def _get_model():
+    return GenerativeModel(model_name="gemini-1.5-flash")
+
+# Fast path for requests like "convert 5 feet to meters": a compiled regex
+# plus an alias table resolves the common shape locally, so Gemini is only
+# called when a unit isn't recognised.
+_FAST = re.compile(
+    r"(?i)\s*(?:convert\s+)?([-+]?\d+(?:\.\d+)?)\s*(\w+(?:\s+\w+)?)\s+(?:to|in|into)\s+(\w+(?:\s+\w+)?)"
+)
+
+_ALIASES = {
+    "m": "meters", "meter": "meters", "metre": "meters", "metres": "meters",
+    "ft": "feet", "foot": "feet",
+    "in": "inches", "inch": "inches",
+    "cm": "centimeters", "centimeter": "centimeters",
+    "centimetre": "centimeters", "centimetres": "centimeters",
+    "km": "kilometers", "kilometer": "kilometers",
+    "kilometre": "kilometers", "kilometres": "kilometers",
+    "mi": "miles", "mile": "miles",
+    "kg": "kilograms", "kilogram": "kilograms",
+    "lb": "pounds", "lbs": "pounds", "pound": "pounds",
+    "g": "grams", "gram": "grams",
+    "oz": "ounces", "ounce": "ounces",
+    "c": "Celsius", "celsius": "Celsius",
+    "f": "Fahrenheit", "fahrenheit": "Fahrenheit",
+    "k": "Kelvin", "kelvin": "Kelvin",
+    "l": "liters", "liter": "liters", "litre": "liters", "litres": "liters",
+    "gal": "gallons", "gallon": "gallons",
+    "ml": "milliliters", "milliliter": "milliliters",
+    "millilitre": "milliliters", "millilitres": "milliliters",
+    "cubic foot": "cubic feet", "cu ft": "cubic feet",
+}
+
+# Fallback extractor for the occasional fenced response despite JSON mode
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+_UNIT_CATEGORY = {
+    unit: category
+    for category, factors in _CONVERSIONS.items()
+    for unit in factors
+}
+_UNIT_CATEGORY.update({"Celsius": "Temperature", "Fahrenheit": "Temperature", "Kelvin": "Temperature"})
+
+def _normalize_unit(text):
+    unit = " ".join(text.lower().split())
+    unit = _ALIASES.get(unit, unit)
+    return unit if unit in _UNIT_CATEGORY else None
+
+# Cached, UI-free parse. The prompt is deterministic, so repeat queries like
+# "convert 5 feet to meters" short-circuit here instead of paying another API
+# round-trip. Returns (parsed, error); API failures are raised rather than
+# returned so transient errors don't get memoized.
+@st.cache_data(show_spinner=False, max_entries=512)
+def _parse_cached(input_text):
+    model = _get_model()
+
+    prompt = (
+        f'Parse the conversion request "{input_text}" into JSON with keys '
+        'value (number), from_unit, to_unit and category '
+        '("Length", "Weight", "Temperature" or "Volume"). '
+        'Use full unit names like "centimeters", not "cm".'
+    )
+
+    response = model.generate_content(
+        prompt,
+        generation_config={
+            "temperature": 0,
+            "response_mime_type": "application/json"
+        }
+    )
+
+    raw_response = response.text.strip()
+
+    m = _FENCE.search(raw_response)
+    if m:
+        raw_response = m.group(1).strip()
+
+    try:
+        if orjson is not None:
+            result = orjson.loads(raw_response)
+        else:
+            result = json.loads(raw_response)
+    except ValueError as e:
+        return None, f"Failed to parse JSON: {e}"
+
+    try:
+        value = result["value"]
+        from_unit = result["from_unit"]
+        to_unit = result["to_unit"]
+        category = result["category"]
+    except KeyError:
+        return None, "Response is missing required keys."
+
+    if category not in ("Length", "Weight", "Temperature", "Volume"):
+        return None, f"Invalid category: {category}. Must be one of Length, Weight, Temperature or Volume."
+
+    return (float(value), from_unit, to_unit, category), None
+
+def _fast_parse(input_text):
+    m = _FAST.match(input_text)
+    if not m:
+        return None
+    from_unit = _normalize_unit(m.group(2))
+    to_unit = _normalize_unit(m.group(3))
+    if from_unit and to_unit and _UNIT_CATEGORY[from_unit] == _UNIT_CATEGORY[to_unit]:
+        return float(m.group(1)), from_unit, to_unit, _UNIT_CATEGORY[from_unit]
+    return None
+
+# Warm the parse cache as soon as the text input commits (Enter/blur), so the
+# button click usually finds the result already memoized instead of waiting on
+# the network. Only inputs the regex fast path can't handle need warming.
+def _prefetch():
+    text = st.session_state.get("ai_input", "")
+    if text and _fast_parse(text) is None:
+        try:
+            _parse_cached(text)
+        except Exception:
+            pass  # transient errors surface on the explicit convert click
+
+# Gemini Parsing Function
+def parse_with_gemini(input_text):
+    parsed = _fast_parse(input_text)
+    if parsed:
+        return parsed
+
+    try:
+        parsed, error = _parse_cached(input_text)
+    except Exception as e:
+        st.error(f"Gemini API error: {str(e)}", icon="🚫")
+        return None
+
+    if error:
+        st.error(error, icon="❌")
+        return None
+
+    return parsed
 
 # Streamlit App
 st.title("✨ VIP Unit Converter ✨")
@@ -199,17 +312,8 @@ st.markdown("Transform units with style! Use manual controls or ask AI like 'con
 # Tabs with emojis
 tab1, tab2 = st.tabs(["📏 Manual Mode", "🤖 AI Mode"])
 
-# Unit options
-unit_options = {
-    "Length": ["meters", "feet", "inches", "centimeters", "kilometers", "miles"],
-    "Weight": ["kilograms", "pounds", "grams", "ounces"],
-    "Temperature": ["Celsius", "Fahrenheit", "Kelvin"],
-    "Volume": ["liters", "gallons", "milliliters", "cubic feet"]
-}
-
 with tab1:
     st.markdown("### Manual Conversion", unsafe_allow_html=True)
-    categories = ["Length", "Weight", "Temperature", "Volume"]
     category = st.selectbox("Category 🌈", categories, key="manual_category")
     
     col1, col2 = st.columns(2)
@@ -223,13 +327,13 @@ with tab1:
     if st.button("Convert Now 🚀", key="manual_button"):
         if value >= 0:
             result = convert_units(value, from_unit, to_unit, category)
-            st.success(f"{value} {from_unit} = **{result:.4f} {to_unit}** 🎉", icon="✅")
+            st.success(_RESULT_FMT % (value, from_unit, result, to_unit), icon="✅")
         else:
             st.error("Please enter a positive value! ❌", icon="🚫")
 
 with tab2:
     st.markdown("### AI-Powered Conversion", unsafe_allow_html=True)
-    user_input = st.text_input("Ask me anything! (e.g., 'convert 56cm to meters') 💬", "")
+    user_input = st.text_input("Ask me anything! (e.g., 'convert 56cm to meters') 💬", "", key="ai_input", on_change=_prefetch)
     if st.button("Convert with AI 🌟", key="ai_button"):
         if user_input:
             with st.spinner("Processing with AI magic... ✨"):
@@ -238,7 +342,7 @@ with tab2:
                     value, from_unit, to_unit, category = parsed
                     try:
                         result = convert_units(float(value), from_unit, to_unit, category)
-                        st.success(f"{value} {from_unit} = **{result:.4f} {to_unit}** 🎉", icon="✅")
+                        st.success(_RESULT_FMT % (value, from_unit, result, to_unit), icon="✅")
                     except KeyError as e:
                         st.error(f"Unsupported unit: {e}. Use full names like 'meters'! ❌", icon="🚫")
                     except ValueError: